@@ -1,10 +1,27 @@
+import asyncio
+import hashlib
 from dataclasses import dataclass, field
 import typing as t
+import logging
 from ragas.metrics.base import MetricWithLLM, SingleTurnMetric, MetricType
 from ragas.callbacks import Callbacks
 from ragas.dataset_schema import SingleTurnSample
 from ragas.prompt import PydanticPrompt
 from pydantic import BaseModel, Field
+from metrics.prompts import CachedSignaturePrompt
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sample columns read by the metrics that judge all generated components at once
+GENERATED_COMPONENT_COLUMNS = frozenset({
+    "context",
+    "title_generated",
+    "tldr_generated",
+    "references_generated",
+    "tags_generated"
+})
 
 
 class CoherenceInput(BaseModel):
@@ -24,7 +41,7 @@ class CoherenceOutput(BaseModel):
     reasoning: str = Field(description="Brief explanation of the score")
 
 
-class CoherencePrompt(PydanticPrompt[CoherenceInput, CoherenceOutput]):
+class CoherencePrompt(CachedSignaturePrompt[CoherenceInput, CoherenceOutput]):
     instruction = """You are an expert evaluator tasked with measuring the coherence and relevance of AI-generated content components.
 
 Evaluate how well the generated title, TL;DR, references, and tags relate to each other and to the original context.
@@ -68,16 +85,12 @@ class ContentCoherenceMetric(MetricWithLLM, SingleTurnMetric):
     
     name: str = "content_coherence"
     
-    _required_columns: t.Dict[MetricType, t.Set[str]] = field(
-        default_factory=lambda: {
-            MetricType.SINGLE_TURN: {
-                "context",
-                "title_generated", 
-                "tldr_generated", 
-                "references_generated", 
-                "tags_generated"
-            }
-        }
+    # Shared by all instances; ragas only reads the mapping or replaces it as a whole
+    _REQUIRED_COLUMNS: t.ClassVar[t.Dict[MetricType, t.FrozenSet[str]]] = {
+        MetricType.SINGLE_TURN: GENERATED_COMPONENT_COLUMNS
+    }
+    _required_columns: t.Dict[MetricType, t.FrozenSet[str]] = field(
+        default_factory=lambda: ContentCoherenceMetric._REQUIRED_COLUMNS
     )
     
     coherence_prompt: PydanticPrompt = field(default_factory=CoherencePrompt)
@@ -105,7 +118,7 @@ class ContentCoherenceMetric(MetricWithLLM, SingleTurnMetric):
         
         # Check if context is available
         if not context:
-            print("Warning: No context found in sample")
+            logger.warning("No context found in sample")
             return 0.0
         
         # Prepare the prompt input
@@ -128,5 +141,163 @@ class ContentCoherenceMetric(MetricWithLLM, SingleTurnMetric):
             return prompt_response.score
             
         except Exception as e:
-            print(f"Error in LLM generation: {e}")
-            return 0.5  # Default score if LLM fails
\ No newline at end of file
+            logger.warning(f"Error in LLM generation: {e}")
+            return 0.5  # Default score if LLM fails
+
+class CombinedEvalInput(BaseModel):
+    # The rendered prompt starts with the instruction, output schema and examples,
+    # identical for every call and cacheable by the provider; the inputs follow
+    context: str = Field(description="The original publication content/context")
+    title_generated: str = Field(description="AI generated title")
+    tldr_generated: str = Field(description="AI generated TL;DR summary")
+    references_generated: str = Field(description="AI generated references")
+    tags_generated: str = Field(description="AI generated tags")
+
+
+class CombinedEvalOutput(BaseModel):
+    title_faithfulness: float = Field(
+        description="Faithfulness of the title to the context, between 0 and 1",
+        ge=0.0,
+        le=1.0
+    )
+    tldr_faithfulness: float = Field(
+        description="Faithfulness of the TL;DR to the context, between 0 and 1",
+        ge=0.0,
+        le=1.0
+    )
+    references_faithfulness: float = Field(
+        description="Faithfulness of the references to the context, between 0 and 1",
+        ge=0.0,
+        le=1.0
+    )
+    tags_faithfulness: float = Field(
+        description="Faithfulness of the tags to the context, between 0 and 1",
+        ge=0.0,
+        le=1.0
+    )
+    content_coherence: float = Field(
+        description="Coherence score between 0 and 1",
+        ge=0.0,
+        le=1.0
+    )
+    reasoning: str = Field(description="Brief explanation of the scores")
+
+
+class CombinedEvalPrompt(CachedSignaturePrompt[CombinedEvalInput, CombinedEvalOutput]):
+    instruction = """You are an expert evaluator tasked with judging AI-generated content components against the original publication context.
+
+Perform the following five scoring tasks. Each score is between 0 and 1.
+
+1. **title_faithfulness**: Fraction of the claims made by the generated title that can be directly inferred from the context.
+2. **tldr_faithfulness**: Fraction of the claims made by the generated TL;DR that can be directly inferred from the context.
+3. **references_faithfulness**: Fraction of the generated references that are actually mentioned in or supported by the context.
+4. **tags_faithfulness**: Fraction of the generated tags that accurately represent topics and themes present in the context.
+
+For the faithfulness tasks, only use the context as the source of truth. If a component is empty, score it 0.
+
+5. **content_coherence**: How well the generated title, TL;DR, references, and tags relate to each other and to the context.
+   - Context Relevance (40% weight): Do all components accurately reflect the main content and themes of the context?
+   - Internal Coherence (35% weight): Do the components tell a consistent story without contradictions? Do the tags align with the title and TL;DR?
+   - Thematic Consistency (25% weight): Do all components keep the same focus, scope and terminology? Do the references support the title and TL;DR?
+
+Rate coherence on a scale of 0 to 1:
+- 1.0: Perfect coherence - all components are highly relevant to context and perfectly aligned with each other
+- 0.8-0.9: Very coherent - minor inconsistencies but overall strong alignment
+- 0.6-0.7: Moderately coherent - some misalignment between components or with context
+- 0.4-0.5: Poor coherence - significant inconsistencies or irrelevance to context
+- 0.0-0.3: Very poor coherence - major contradictions or completely off-topic components"""
+    
+    input_model = CombinedEvalInput
+    output_model = CombinedEvalOutput
+
+
+@dataclass
+class CombinedFaithfulnessCoherenceMetric(MetricWithLLM, SingleTurnMetric):
+    """
+    Custom metric that scores the faithfulness of every generated component
+    and their overall coherence with a single LLM call.
+    
+    The context is sent once per sample instead of once per faithfulness
+    check plus once for coherence, and identical samples are judged only
+    once per instance. Use `score_components` to get all five scores; the
+    single-turn API returns the content coherence score.
+    """
+    
+    name: str = "combined_faithfulness_coherence"
+    
+    _REQUIRED_COLUMNS: t.ClassVar[t.Dict[MetricType, t.FrozenSet[str]]] = {
+        MetricType.SINGLE_TURN: GENERATED_COMPONENT_COLUMNS
+    }
+    _required_columns: t.Dict[MetricType, t.FrozenSet[str]] = field(
+        default_factory=lambda: CombinedFaithfulnessCoherenceMetric._REQUIRED_COLUMNS
+    )
+    
+    combined_prompt: PydanticPrompt = field(default_factory=CombinedEvalPrompt)
+    
+    # Pending and finished judgments keyed by a hash of the prompt input, so identical
+    # samples (duplicate rows, the same row in several datasets) are judged once
+    _judgments: t.Dict[str, asyncio.Future] = field(default_factory=dict, repr=False)
+    
+    async def score_components(
+        self, sample: SingleTurnSample, callbacks: Callbacks = None
+    ) -> CombinedEvalOutput:
+        """
+        Score faithfulness of each generated component and content coherence.
+        
+        Args:
+            sample: The sample containing context and generated content
+            callbacks: Callbacks for monitoring
+            
+        Returns:
+            CombinedEvalOutput with the four faithfulness scores and coherence
+        """
+        prompt_input = CombinedEvalInput(
+            context=getattr(sample, 'context', '') or '',
+            title_generated=getattr(sample, 'title_generated', '') or '',
+            tldr_generated=getattr(sample, 'tldr_generated', '') or '',
+            references_generated=getattr(sample, 'references_generated', '') or '',
+            tags_generated=getattr(sample, 'tags_generated', '') or ''
+        )
+        
+        key = hashlib.sha256(prompt_input.model_dump_json().encode()).hexdigest()
+        judgment = self._judgments.get(key)
+        if judgment is None:
+            judgment = asyncio.ensure_future(
+                self.combined_prompt.generate(
+                    data=prompt_input,
+                    llm=self.llm,
+                    callbacks=callbacks
+                )
+            )
+            self._judgments[key] = judgment
+            
+            def _forget_failure(future):
+                # Failed judgments are not kept, a later identical sample retries
+                if future.cancelled() or future.exception() is not None:
+                    self._judgments.pop(key, None)
+            
+            judgment.add_done_callback(_forget_failure)
+        
+        # Shield the shared judgment so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(judgment)
+    
+    async def _single_turn_ascore(
+        self, sample: SingleTurnSample, callbacks: Callbacks
+    ) -> float:
+        """
+        Evaluate the coherence of generated content components.
+        
+        Args:
+            sample: The sample containing context and generated content
+            callbacks: Callbacks for monitoring
+            
+        Returns:
+            Float score between 0 and 1 indicating coherence level
+        """
+        try:
+            prompt_response = await self.score_components(sample, callbacks)
+            return prompt_response.content_coherence
+            
+        except Exception as e:
+            logger.warning(f"Error in LLM generation: {e}")
+            return 0.5  # Default score if LLM fails
@@ -1,10 +1,17 @@
+import asyncio
 from dataclasses import dataclass, field
 import typing as t
+import logging
+import numpy as np
 from ragas.metrics.base import MetricWithLLM, SingleTurnMetric, MetricType
 from ragas.callbacks import Callbacks
 from ragas.dataset_schema import SingleTurnSample
 from ragas.prompt import PydanticPrompt
 from pydantic import BaseModel, Field
+from metrics.prompts import CachedSignaturePrompt
+
+
+logger = logging.getLogger(__name__)
 
 
 class ConcisenessInput(BaseModel):
@@ -22,7 +29,7 @@ class ConcisenessOutput(BaseModel):
     reasoning: str = Field(description="Brief explanation of the score")
 
 
-class ConcisenessPrompt(PydanticPrompt[ConcisenessInput, ConcisenessOutput]):
+class ConcisenessPrompt(CachedSignaturePrompt[ConcisenessInput, ConcisenessOutput]):
     instruction = """You are an expert evaluator tasked with measuring how concise and efficient a response is.
 
 Evaluate the conciseness of the given response compared to the reference answer.
@@ -64,6 +71,10 @@ class ResponseConcisenessMetric(MetricWithLLM, SingleTurnMetric):
     
     conciseness_prompt: PydanticPrompt = field(default_factory=ConcisenessPrompt)
     
+    # Seconds before a judge call is abandoned and retried; None uses the LLM's run config timeout
+    request_timeout: t.Optional[float] = field(default=None)
+    max_retries: int = field(default=2)  # Retries after a timed out judge call
+    
     async def _single_turn_ascore(
         self, sample: SingleTurnSample, callbacks: Callbacks
     ) -> float:
@@ -75,7 +86,8 @@ class ResponseConcisenessMetric(MetricWithLLM, SingleTurnMetric):
             callbacks: Callbacks for monitoring
             
         Returns:
-            Float score between 0 and 1 indicating conciseness level
+            Float score between 0 and 1 indicating conciseness level, NaN if no
+            judgment could be obtained from the LLM
         """
         
         # Prepare the prompt input
@@ -85,16 +97,31 @@ class ResponseConcisenessMetric(MetricWithLLM, SingleTurnMetric):
             reference=sample.reference if sample.reference else "Not provided"
         )
         
+        timeout = self.request_timeout if self.request_timeout is not None else self.llm.run_config.timeout
+        
         try:
-            # Generate response using the PydanticPrompt
-            prompt_response = await self.conciseness_prompt.generate(
-                data=prompt_input, 
-                llm=self.llm,
-                callbacks=callbacks
-            )
-            
-            return prompt_response.score
+            for attempt in range(self.max_retries + 1):
+                try:
+                    # Generate response using the PydanticPrompt; a slow response
+                    # is cut off and retried instead of stalling the evaluation
+                    prompt_response = await asyncio.wait_for(
+                        self.conciseness_prompt.generate(
+                            data=prompt_input, 
+                            llm=self.llm,
+                            callbacks=callbacks
+                        ),
+                        timeout=timeout
+                    )
+                    
+                    return prompt_response.score
+                    
+                except asyncio.TimeoutError:
+                    if attempt == self.max_retries:
+                        raise
+                    # Exponential backoff: 0.5s, 1s, 2s, ...
+                    await asyncio.sleep(0.5 * 2 ** attempt)
             
         except Exception as e:
-            print(f"Error in LLM generation: {e}")
-            return 0.5  # Default score if LLM fails
\ No newline at end of file
+            logger.warning(f"Error in LLM generation: {e!r}")
+            # No judgment: report a missing score rather than a made-up one
+            return np.nan
\ No newline at end of file
@@ -3,6 +3,7 @@ import os
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from bs4 import SoupStrainer
 from dotenv import load_dotenv
 from langchain_community.document_loaders import WebBaseLoader
 from ragas.llms import LangchainLLMWrapper
@@ -10,7 +11,9 @@ from ragas.embeddings import LangchainEmbeddingsWrapper
 from langchain_openai import ChatOpenAI
 from langchain_openai import OpenAIEmbeddings
 from ragas.testset import TestsetGenerator
-from paths import TEST_SET_CSV_STR
+from ragas.run_config import RunConfig
+from paths import TEST_SET_CSV_STR, TEST_SET_PARQUET_STR
+from metrics.utils import create_cached_embeddings
 
 
 # Load environment variables from .env file
@@ -18,22 +21,38 @@ load_dotenv()
 
 
 
-# Load documents from URL
-loader = WebBaseLoader("https://python.langchain.com/docs/integrations/document_loaders")
+# Load documents from URL, parsing only the page's <main> content instead of the
+# whole document with its navigation, sidebars and footer
+loader = WebBaseLoader(
+    "https://python.langchain.com/docs/integrations/document_loaders",
+    bs_kwargs={"parse_only": SoupStrainer("main")}
+)
 docs = loader.load()
 
 
 
 generator_llm = LangchainLLMWrapper(ChatOpenAI(model="gpt-4o"))
-generator_embeddings = LangchainEmbeddingsWrapper(OpenAIEmbeddings())
+generator_embeddings = LangchainEmbeddingsWrapper(
+    create_cached_embeddings(OpenAIEmbeddings(), namespace="text-embedding-ada-002")
+)
 
 
 generator = TestsetGenerator(llm=generator_llm, embedding_model=generator_embeddings)
-dataset = generator.generate_with_langchain_docs(docs, testset_size=10)
+# The generator runs its LLM calls concurrently; size the pool from RAGAS_CONCURRENCY
+dataset = generator.generate_with_langchain_docs(
+    docs,
+    testset_size=10,
+    run_config=RunConfig(max_workers=int(os.getenv("RAGAS_CONCURRENCY", "16")))
+)
 # Convert to pandas DataFrame for easier viewing
 df = dataset.to_pandas()
 print(df.head())
 
 # Save to CSV
 df.to_csv(TEST_SET_CSV_STR, index=False)
-print("Test set saved to test_set.csv")
\ No newline at end of file
+print("Test set saved to test_set.csv")
+
+# Save to Parquet as well: list columns such as reference_contexts are kept as
+# native lists, so loading them back needs no string parsing
+df.to_parquet(TEST_SET_PARQUET_STR, engine='pyarrow', compression='zstd', index=False)
+print("Test set saved to test_set.parquet")
\ No newline at end of file
@@ -0,0 +1,24 @@
+import typing as t
+from ragas.prompt import PydanticPrompt
+from ragas.prompt.pydantic_prompt import InputModel, OutputModel
+
+
+# Rendered output signatures, keyed by output model
+_OUTPUT_SIGNATURES: t.Dict[t.Type, str] = {}
+
+
+class CachedSignaturePrompt(PydanticPrompt[InputModel, OutputModel]):
+    """
+    PydanticPrompt that renders the output schema once per output model.
+    
+    PydanticPrompt builds the JSON schema of the output model and serializes it
+    on every call to to_string(), which costs more than rendering the input.
+    The schema never changes, so the rendered text is cached and reused.
+    """
+    
+    def _generate_output_signature(self, indent: int = 4) -> str:
+        signature = _OUTPUT_SIGNATURES.get(self.output_model)
+        if signature is None:
+            signature = super()._generate_output_signature(indent)
+            _OUTPUT_SIGNATURES[self.output_model] = signature
+        return signature
@@ -1,17 +1,74 @@
 from dataclasses import dataclass, field
 import typing as t
+import logging
+import sys
+from operator import attrgetter
 import json
-from sklearn.metrics import jaccard_score
-from sklearn.preprocessing import MultiLabelBinarizer
+import ast
+import orjson
+from functools import lru_cache
 from ragas.metrics.base import SingleTurnMetric, MetricType
 from ragas.callbacks import Callbacks
 from ragas.dataset_schema import SingleTurnSample
 
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def _parse_references(
+    references_data: str, case_sensitive: bool
+) -> t.Tuple[t.Tuple[str, ...], t.Tuple[str, ...]]:
+    """
+    Parse a references string into URLs and titles.
+    
+    Results are cached, so a truth string scored against several generated
+    outputs (or by several metric instances) is only parsed once.
+    
+    Args:
+        references_data: String representation of a list of reference dicts
+        case_sensitive: Whether to keep the original case of URLs and titles
+        
+    Returns:
+        Tuple of (urls, titles)
+    """
+    try:
+        if references_data.strip():
+            try:
+                refs_list = orjson.loads(references_data)
+            except orjson.JSONDecodeError:
+                # Python-repr lists (single-quoted) are parsed as literals only, never evaluated
+                refs_list = ast.literal_eval(references_data)
+        else:
+            refs_list = []
+    except Exception as e:
+        logger.warning(f"Error parsing references: {e}\nReferences data: {references_data}")
+        refs_list = []
+    
+    if not isinstance(refs_list, (list, tuple)):
+        refs_list = []
+    refs = [ref for ref in refs_list if isinstance(ref, dict)]
+    
+    # Pick the normalization once instead of branching per item
+    normalize = str.strip if case_sensitive else (lambda value: value.strip().lower())
+    
+    # URLs and titles are interned, so set lookups between truth and generated
+    # references match by identity before comparing characters. Missing, null or
+    # non-string values are skipped, like empty ones
+    def _extract(key):
+        values = (ref.get(key) for ref in refs)
+        return [sys.intern(value) for value in (normalize(v) for v in values if isinstance(v, str)) if value]
+    
+    urls = _extract('url')
+    titles = _extract('title')
+    
+    return tuple(urls), tuple(titles)
+
+
 @dataclass
 class ReferencesJaccardMetric(SingleTurnMetric):
     """
-    Custom metric to calculate Jaccard similarity for references using sklearn.
+    Custom metric to calculate Jaccard similarity for references.
     
     Handles references as list of dictionaries with 'url' and 'title' keys.
     Calculates Jaccard scores separately for URLs and titles, then averages them.
@@ -27,72 +84,77 @@ class ReferencesJaccardMetric(SingleTurnMetric):
     case_sensitive: bool = field(default=False)
     strip_whitespace: bool = field(default=True)
     
+    # Parsed truth per publication id: {pub_id: (truth_text, (urls, titles))}
+    _truth_cache: t.Dict[t.Any, t.Tuple[str, t.Tuple[t.FrozenSet[str], t.FrozenSet[str]]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    
     def __post_init__(self):
-        """Set required columns based on configured column names."""
+        """Set required columns and the column accessor based on configured column names."""
         if self._required_columns is None:
             self._required_columns = {
                 MetricType.SINGLE_TURN: {self.generated_column, self.truth_column}
             }
+        # Reads (generated, truth) from a sample in one C-level call
+        self._get_columns = attrgetter(self.generated_column, self.truth_column)
     
     def init(self, run_config):
         """Initialize the metric. Required by SingleTurnMetric."""
         pass
 
-    def _parse_references(self, references_data) -> t.Tuple[t.List[str], t.List[str]]:
+    def _parse_references(self, references_data) -> t.Tuple[t.Tuple[str, ...], t.Tuple[str, ...]]:
         """
-        Parse references data into lists of URLs and titles.
+        Parse references data into URLs and titles, reusing earlier parses of the same data.
         
         Args:
             references_data: Either a string representation of list or actual list
             
         Returns:
-            Tuple of (urls_list, titles_list)
+            Tuple of (urls, titles)
         """
-        urls = []
-        titles = []
+        if isinstance(references_data, list):
+            # Canonicalize lists to a JSON string so they share the parse cache
+            try:
+                references_data = json.dumps(references_data)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Error parsing references: {e}\nReferences data: {references_data}")
+                return (), ()
+        elif not isinstance(references_data, str):
+            return (), ()
         
-        try:
-            # Handle string representation of list
-            if isinstance(references_data, str):
-                if references_data.strip():
-                    # Use json.loads instead of eval for safety
-                    try:
-                        refs_list = json.loads(references_data)
-                    except json.JSONDecodeError:
-                        # If JSON parsing fails, try eval as fallback (with caution)
-                        refs_list = eval(references_data)
-                else:
-                    refs_list = []
-            elif isinstance(references_data, list):
-                refs_list = references_data
-            else:
-                refs_list = []
-            
-            for ref in refs_list:
-                if isinstance(ref, dict):
-                    # Extract URL
-                    url = ref.get('url', '').strip()
-                    if url:
-                        if not self.case_sensitive:
-                            url = url.lower()
-                        urls.append(url)
-                    
-                    # Extract title
-                    title = ref.get('title', '').strip()
-                    if title:
-                        if not self.case_sensitive:
-                            title = title.lower()
-                        titles.append(title)
-                        
-        except Exception as e:
-            print(f"Error parsing references: {e}")
-            print(f"References data: {references_data}")
-            
-        return urls, titles
+        return _parse_references(references_data, self.case_sensitive)
 
-    def _calculate_sklearn_jaccard(self, y_true: t.List[str], y_pred: t.List[str]) -> float:
+    def prepare(self, df) -> None:
         """
-        Calculate Jaccard similarity using sklearn's jaccard_score.
+        Parse the truth column of a dataset, keyed by publication id.
+        
+        Args:
+            df: DataFrame with publication_external_id and the truth column
+        """
+        for pub_id, truth_refs in zip(df['publication_external_id'], df[self.truth_column]):
+            if isinstance(truth_refs, str):
+                urls, titles = self._parse_references(truth_refs)
+                self._truth_cache[pub_id] = (truth_refs, (frozenset(urls), frozenset(titles)))
+    
+    def _truth_references(self, truth_refs, pub_id=None) -> t.Tuple[t.Collection[str], t.Collection[str]]:
+        """
+        Return the truth URLs and titles, from the prepare() cache when the data is unchanged.
+        
+        Args:
+            truth_refs: Ground truth references (string representation or list)
+            pub_id: Publication id the references belong to, if known
+            
+        Returns:
+            Tuple of (urls, titles)
+        """
+        cached = self._truth_cache.get(pub_id) if pub_id is not None else None
+        if cached is not None and cached[0] == truth_refs:
+            return cached[1]
+        return self._parse_references(truth_refs)
+    
+    def _calculate_jaccard(self, y_true: t.Collection[str], y_pred: t.Collection[str]) -> float:
+        """
+        Calculate Jaccard similarity of two label lists with set arithmetic.
         
         Args:
             y_true: Ground truth labels
@@ -101,36 +163,75 @@ class ReferencesJaccardMetric(SingleTurnMetric):
         Returns:
             Jaccard similarity score between 0 and 1
         """
-        try:
-            # Handle empty lists
-            if not y_true and not y_pred:
-                return 0.0  # Perfect match for empty sets
-            
-            if not y_true or not y_pred:
-                return 0.0  # No similarity if one set is empty
-            
-            # Create all unique labels from both sets
-            all_labels = list(set(y_true + y_pred))
-            
-            if not all_labels:
-                return 0.0  # Both empty after preprocessing
-            
-            # Use MultiLabelBinarizer to convert to binary format
-            mlb = MultiLabelBinarizer(classes=all_labels)
+        # Handle empty lists
+        if not y_true and not y_pred:
+            return 0.0  # Empty sets are scored as no match
+        
+        if not y_true or not y_pred:
+            return 0.0  # No similarity if one set is empty
+        
+        true_set = y_true if isinstance(y_true, frozenset) else set(y_true)
+        pred_set = set(y_pred)
+        
+        # |A ∪ B| = |A| + |B| - |A ∩ B|, so the union is never built
+        intersection = len(true_set & pred_set)
+        return intersection / (len(true_set) + len(pred_set) - intersection)
+    
+    def _score_pair(self, generated_refs, truth_refs, pub_id=None) -> float:
+        """
+        Calculate Jaccard similarity between generated and ground truth references.
+        
+        Args:
+            generated_refs: Generated references (string representation or list)
+            truth_refs: Ground truth references (string representation or list)
+            pub_id: Publication id of the pair, used to look up prepared truth references
             
-            # Convert to binary matrices
-            y_true_binary = mlb.fit_transform([y_true])
-            y_pred_binary = mlb.transform([y_pred])
+        Returns:
+            Float score between 0 and 1 (average of URL and title Jaccard scores)
+        """
+        try:
+            # Parse references into URLs and titles; identical inputs are parsed once
+            gen_urls, gen_titles = self._parse_references(generated_refs)
+            if isinstance(truth_refs, str) and truth_refs == generated_refs:
+                truth_urls, truth_titles = gen_urls, gen_titles
+            else:
+                truth_urls, truth_titles = self._truth_references(truth_refs, pub_id)
             
-            # Calculate Jaccard score using sklearn
-            score = jaccard_score(y_true_binary, y_pred_binary, average='samples', zero_division=0.0)
+            # Calculate Jaccard scores separately
+            url_jaccard = self._calculate_jaccard(truth_urls, gen_urls)
+            title_jaccard = self._calculate_jaccard(truth_titles, gen_titles)
             
-            return float(score)
+            # Return average of both scores
+            return (url_jaccard + title_jaccard) / 2.0
             
         except Exception as e:
-            print(f"Error in sklearn Jaccard calculation: {e}")
+            logger.warning(f"Error calculating references Jaccard similarity: {e}")
             return 0.0
     
+    def score_batch(
+        self,
+        generated_refs: t.Sequence[t.Any],
+        truth_refs: t.Sequence[t.Any],
+        pub_ids: t.Optional[t.Sequence[t.Any]] = None,
+    ) -> t.List[float]:
+        """
+        Calculate references Jaccard similarity for many pairs without per-sample async dispatch.
+        
+        Args:
+            generated_refs: Generated references, one entry per sample
+            truth_refs: Ground truth references, aligned with generated_refs
+            pub_ids: Publication ids aligned with the references, used to look up prepared truth
+            
+        Returns:
+            List of scores between 0 and 1, one per pair
+        """
+        if pub_ids is None:
+            pub_ids = [None] * len(generated_refs)
+        return [
+            self._score_pair(generated or "", truth or "", pub_id)
+            for generated, truth, pub_id in zip(generated_refs, truth_refs, pub_ids)
+        ]
+    
     async def _single_turn_ascore(
         self, sample: SingleTurnSample, callbacks: Callbacks
     ) -> float:
@@ -144,25 +245,17 @@ class ReferencesJaccardMetric(SingleTurnMetric):
         Returns:
             Float score between 0 and 1 (average of URL and title Jaccard scores)
         """
+        # Extract references data
         try:
-            # Extract references data
-            generated_refs = getattr(sample, self.generated_column, '') or ""
-            truth_refs = getattr(sample, self.truth_column, '') or ""
-            
-            # Parse references into URLs and titles
-            gen_urls, gen_titles = self._parse_references(generated_refs)
-            truth_urls, truth_titles = self._parse_references(truth_refs)
-            
-            # Calculate Jaccard scores separately using sklearn
-            url_jaccard = self._calculate_sklearn_jaccard(truth_urls, gen_urls)
-            title_jaccard = self._calculate_sklearn_jaccard(truth_titles, gen_titles)
-            
-            # Return average of both scores
-            return (url_jaccard + title_jaccard) / 2.0
-            
-        except Exception as e:
-            print(f"Error calculating references Jaccard similarity: {e}")
-            return 0.0
+            generated_refs, truth_refs = self._get_columns(sample)
+        except AttributeError:
+            # Samples may lack a column; treat it as empty like the other missing values
+            generated_refs = getattr(sample, self.generated_column, '')
+            truth_refs = getattr(sample, self.truth_column, '')
+        generated_refs = generated_refs or ""
+        truth_refs = truth_refs or ""
+        
+        return self._score_pair(generated_refs, truth_refs, getattr(sample, 'publication_external_id', None))
 
 
 def create_references_jaccard_metric() -> ReferencesJaccardMetric:
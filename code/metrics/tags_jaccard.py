@@ -1,16 +1,20 @@
 from dataclasses import dataclass, field
 import typing as t
-from sklearn.metrics import jaccard_score
-from sklearn.preprocessing import MultiLabelBinarizer
+import logging
+import sys
+from operator import attrgetter
 from ragas.metrics.base import SingleTurnMetric, MetricType
 from ragas.callbacks import Callbacks
 from ragas.dataset_schema import SingleTurnSample
 
 
+logger = logging.getLogger(__name__)
+
+
 @dataclass
 class TagsJaccardSimilarityMetric(SingleTurnMetric):
     """
-    Custom metric to calculate Jaccard similarity between two sets of text using sklearn.
+    Custom metric to calculate Jaccard similarity between two sets of text.
     
     Jaccard similarity = |intersection| / |union|
     Used for comparing any two columns containing delimited text data.
@@ -28,12 +32,19 @@ class TagsJaccardSimilarityMetric(SingleTurnMetric):
     case_sensitive: bool = field(default=False)  # Case sensitivity option
     strip_whitespace: bool = field(default=True)  # Strip whitespace from items
     
+    # Pre-tokenized truth per publication id: {pub_id: (truth_text, tokens)}
+    _truth_cache: t.Dict[t.Any, t.Tuple[str, t.FrozenSet[str]]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    
     def __post_init__(self):
-        """Set required columns based on configured column names."""
+        """Set required columns and the column accessor based on configured column names."""
         if self._required_columns is None:
             self._required_columns = {
                 MetricType.SINGLE_TURN: {self.generated_column, self.truth_column}
             }
+        # Reads (generated, truth) from a sample in one C-level call
+        self._get_columns = attrgetter(self.generated_column, self.truth_column)
     
     def init(self, run_config):
         """Initialize the metric. Required by SingleTurnMetric."""
@@ -52,24 +63,47 @@ class TagsJaccardSimilarityMetric(SingleTurnMetric):
         if not text or text.strip() == "":
             return []
         
-        # Split by delimiter
+        # Lowercase the whole string once rather than each item
+        if not self.case_sensitive:
+            text = text.lower()
+        
         items = text.split(self.delimiter)
+        if self.strip_whitespace:
+            items = map(str.strip, items)
+        # Interned items are shared between truth and generated sets, so set lookups
+        # match them by identity before comparing characters
+        return [sys.intern(item) for item in items if item]
+    
+    def prepare(self, df) -> None:
+        """
+        Pre-tokenize the truth column of a dataset, keyed by publication id.
         
-        # Process each item
-        processed_items = []
-        for item in items:
-            if self.strip_whitespace:
-                item = item.strip()
-            if not self.case_sensitive:
-                item = item.lower()
-            if item:  # Only add non-empty items
-                processed_items.append(item)
+        Args:
+            df: DataFrame with publication_external_id and the truth column
+        """
+        for pub_id, truth_text in zip(df['publication_external_id'], df[self.truth_column]):
+            if isinstance(truth_text, str):
+                self._truth_cache[pub_id] = (truth_text, frozenset(self._preprocess_text(truth_text)))
+    
+    def _truth_tokens(self, truth_text: str, pub_id=None) -> t.FrozenSet[str]:
+        """
+        Return the truth tokens, from the prepare() cache when the text is unchanged.
         
-        return processed_items
+        Args:
+            truth_text: Ground truth delimited text
+            pub_id: Publication id the text belongs to, if known
+            
+        Returns:
+            Set of processed truth items
+        """
+        cached = self._truth_cache.get(pub_id) if pub_id is not None else None
+        if cached is not None and cached[0] == truth_text:
+            return cached[1]
+        return frozenset(self._preprocess_text(truth_text))
     
-    def _calculate_sklearn_jaccard(self, y_true: t.List[str], y_pred: t.List[str]) -> float:
+    def _calculate_jaccard(self, y_true: t.Collection[str], y_pred: t.Collection[str]) -> float:
         """
-        Calculate Jaccard similarity using sklearn's jaccard_score.
+        Calculate Jaccard similarity of two label lists with set arithmetic.
         
         Args:
             y_true: Ground truth labels
@@ -78,35 +112,69 @@ class TagsJaccardSimilarityMetric(SingleTurnMetric):
         Returns:
             Jaccard similarity score between 0 and 1
         """
-        try:
-            # Handle empty lists
-            if not y_true and not y_pred:
-                return 1.0  # Perfect match for empty sets
-            
-            if not y_true or not y_pred:
-                return 0.0  # No similarity if one set is empty
-            
-            # Create all unique labels from both sets
-            all_labels = list(set(y_true + y_pred))
-            
-            if not all_labels:
-                return 1.0  # Both empty after preprocessing
-            
-            # Use MultiLabelBinarizer to convert to binary format
-            mlb = MultiLabelBinarizer(classes=all_labels)
+        # Handle empty lists
+        if not y_true and not y_pred:
+            return 1.0  # Perfect match for empty sets
+        
+        if not y_true or not y_pred:
+            return 0.0  # No similarity if one set is empty
+        
+        true_set = y_true if isinstance(y_true, frozenset) else set(y_true)
+        pred_set = set(y_pred)
+        
+        # |A ∪ B| = |A| + |B| - |A ∩ B|, so the union is never built
+        intersection = len(true_set & pred_set)
+        return intersection / (len(true_set) + len(pred_set) - intersection)
+    
+    def _score_pair(self, generated_text: str, truth_text: str, pub_id=None) -> float:
+        """
+        Calculate Jaccard similarity between two delimited texts.
+        
+        Args:
+            generated_text: Generated delimited text
+            truth_text: Ground truth delimited text
+            pub_id: Publication id of the pair, used to look up prepared truth tokens
             
-            # Convert to binary matrices
-            y_true_binary = mlb.fit_transform([y_true])
-            y_pred_binary = mlb.transform([y_pred])
+        Returns:
+            Float score between 0 and 1 indicating Jaccard similarity
+        """
+        try:
+            # Convert to lists
+            generated_list = self._preprocess_text(generated_text)
+            truth_list = self._truth_tokens(truth_text, pub_id)
             
-            # Calculate Jaccard score using sklearn
-            score = jaccard_score(y_true_binary, y_pred_binary, average='samples', zero_division=0.0)
+            # Calculate Jaccard similarity
+            similarity = self._calculate_jaccard(truth_list, generated_list)
             
-            return float(score)
+            return similarity
             
         except Exception as e:
-            print(f"Error in sklearn Jaccard calculation: {e}")
-            return 0.0
+            logger.warning(f"Error calculating Jaccard similarity: {e}")
+            return 0.0  # Return 0 if calculation fails
+    
+    def score_batch(
+        self,
+        generated_texts: t.Sequence[str],
+        truth_texts: t.Sequence[str],
+        pub_ids: t.Optional[t.Sequence[t.Any]] = None,
+    ) -> t.List[float]:
+        """
+        Calculate Jaccard similarity for many pairs without per-sample async dispatch.
+        
+        Args:
+            generated_texts: Generated delimited texts
+            truth_texts: Ground truth delimited texts, aligned with generated_texts
+            pub_ids: Publication ids aligned with the texts, used to look up prepared truth tokens
+            
+        Returns:
+            List of scores between 0 and 1, one per pair
+        """
+        if pub_ids is None:
+            pub_ids = [None] * len(generated_texts)
+        return [
+            self._score_pair(generated_text or "", truth_text or "", pub_id)
+            for generated_text, truth_text, pub_id in zip(generated_texts, truth_texts, pub_ids)
+        ]
     
     async def _single_turn_ascore(
         self, sample: SingleTurnSample, callbacks: Callbacks
@@ -121,23 +189,17 @@ class TagsJaccardSimilarityMetric(SingleTurnMetric):
         Returns:
             Float score between 0 and 1 indicating Jaccard similarity
         """
+        # Extract text from specified columns
         try:
-            # Extract text from specified columns
-            generated_text = getattr(sample, self.generated_column, '') or ""
-            truth_text = getattr(sample, self.truth_column, '') or ""
-            
-            # Convert to lists
-            generated_list = self._preprocess_text(generated_text)
-            truth_list = self._preprocess_text(truth_text)
-            
-            # Calculate Jaccard similarity using sklearn
-            similarity = self._calculate_sklearn_jaccard(truth_list, generated_list)
-            
-            return similarity
-            
-        except Exception as e:
-            print(f"Error calculating Jaccard similarity: {e}")
-            return 0.0  # Return 0 if calculation fails
+            generated_text, truth_text = self._get_columns(sample)
+        except AttributeError:
+            # Samples may lack a column; treat it as empty like the other missing values
+            generated_text = getattr(sample, self.generated_column, '')
+            truth_text = getattr(sample, self.truth_column, '')
+        generated_text = generated_text or ""
+        truth_text = truth_text or ""
+        
+        return self._score_pair(generated_text, truth_text, getattr(sample, 'publication_external_id', None))
 
 
 def create_tags_jaccard_metric() -> TagsJaccardSimilarityMetric:
@@ -1,21 +1,145 @@
 import pandas as pd
-import json
+import numpy as np
+import orjson
+import tiktoken
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import atexit
+import concurrent.futures
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from functools import lru_cache
+from operator import itemgetter
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_community.cache import SQLiteCache
 from paths import (
     GOLDEN_DATASET_CSV_STR,
     GOLDEN_DATASET_JSON_STR,
     EVALUATION_RESULTS_CSV_STR,
-    COMPLETE_EVALUATION_RESULTS_CSV_STR
+    COMPLETE_EVALUATION_RESULTS_CSV_STR,
+    EVALUATION_RESULTS_PARQUET_STR,
+    COMPLETE_EVALUATION_RESULTS_PARQUET_STR,
+    EMBEDDINGS_CACHE_DIR_STR,
+    LLM_CACHE_DB_STR
 )
 
+logger = logging.getLogger(__name__)
 
-def truncate_context(text, max_tokens=8000):
+
+# Score columns produced by the evaluation, in output order
+METRIC_COLUMNS = (
+    'title_semantic_similarity',
+    'title_faithfulness',
+    'tldr_semantic_similarity',
+    'tldr_faithfulness',
+    'references_semantic_similarity',
+    'references_jaccard_similarity',
+    'references_faithfulness',
+    'tags_semantic_similarity',
+    'tags_jaccard_similarity',
+    'tags_faithfulness',
+    'content_coherence'
+)
+
+# Result dict with every metric unset, copied by initialize_result_dict
+_EMPTY_RESULT_TEMPLATE = dict.fromkeys(METRIC_COLUMNS)
+
+# Display name per metric, e.g. "TLDR Semantic" for tldr_semantic_similarity
+_METRIC_LABELS = {
+    col: col.removesuffix('_similarity').replace('_', ' ').title().replace('Tldr', 'TLDR')
+    for col in METRIC_COLUMNS
+}
+
+
+def configure_logging(level="INFO"):
+    """
+    Send log records to stdout through a queue.
+    
+    Handlers on the logging call path only enqueue records; a background
+    listener thread does the actual writes, so logging from the event loop
+    does not block on stdout.
+    
+    Args:
+        level: Logging level name or number (DEBUG shows per-publication scores)
+        
+    Returns:
+        logging.handlers.QueueListener: The started listener, stopped at exit
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(level)
+    # HTTP clients log every request at INFO
+    for name in ("httpx", "openai"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+# Models whose tokenizer failed to load, so the fallback is only warned about once
+_ENCODING_FAILURES = set()
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(model):
+    """
+    Load the tiktoken encoding of a model once per process.
+    
+    Only successful loads are cached; a failure raises and is retried on the next call.
+    
+    Args:
+        model: OpenAI model name
+        
+    Returns:
+        tiktoken Encoding
+    """
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        # Unknown model name: use the encoding of current OpenAI chat models
+        encoding_name = "o200k_base"
+    
+    return tiktoken.get_encoding(encoding_name)
+
+
+def _get_encoding(model):
+    """
+    Get the tiktoken encoding of a model.
+    
+    Args:
+        model: OpenAI model name
+        
+    Returns:
+        tiktoken Encoding, or None if its vocabulary cannot be loaded right now
+    """
+    try:
+        return _load_encoding(model)
+    except Exception as e:
+        # The vocabulary is downloaded on first use and may be unavailable offline
+        level = logging.DEBUG if model in _ENCODING_FAILURES else logging.WARNING
+        _ENCODING_FAILURES.add(model)
+        logger.log(level, f"Could not load tokenizer for {model}, estimating tokens from characters: {e}")
+        return None
+
+
+def truncate_context(text, max_tokens=8000, model="gpt-4o-mini"):
     """
     Truncate context to fit within token limits.
-    Rough estimation: 1 token ≈ 4 characters for English text.
+    Tokens are counted with the tokenizer of the model; if it cannot be loaded,
+    1 token ≈ 4 characters is assumed.
     
     Args:
         text: Input text to truncate
         max_tokens: Maximum number of tokens allowed
+        model: Model whose tokenizer counts the tokens
         
     Returns:
         Truncated text string
@@ -23,32 +147,42 @@ def truncate_context(text, max_tokens=8000):
     if not text:
         return ""
     
-    max_chars = max_tokens * 4  # Conservative estimate
-    if len(text) <= max_chars:
-        return text
+    encoding = _get_encoding(model)
+    if encoding is None:
+        max_chars = max_tokens * 4  # Conservative estimate
+        if len(text) <= max_chars:
+            return text
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        # Cut at the token limit, then refine to a sentence boundary below
+        text = encoding.decode(tokens[:max_tokens])
+        max_chars = len(text)
     
-    # Truncate and try to end at a sentence boundary
-    truncated = text[:max_chars]
-    last_period = truncated.rfind('.')
-    if last_period > max_chars * 0.8:  # If we can find a period in the last 20%
-        return truncated[:last_period + 1]
+    # Try to end at a sentence boundary: search the last 20% of the allowed
+    # range in place instead of copying the prefix first
+    last_period = text.rfind('.', int(max_chars * 0.8) + 1, max_chars)
+    if last_period != -1:
+        return text[:last_period + 1]
     else:
-        return truncated + "..."
+        return text[:max_chars] + "..."
 
 
-def load_dataset(csv_path=GOLDEN_DATASET_CSV_STR):
+def load_dataset(csv_path=GOLDEN_DATASET_CSV_STR, usecols=None):
     """
     Load the main evaluation dataset.
     
     Args:
         csv_path: Path to the CSV file
+        usecols: Optional list of columns to load; all columns are loaded by default
         
     Returns:
         pandas.DataFrame: Loaded dataset
     """
-
-
-    return pd.read_csv(csv_path, nrows=1)
+    # The pyarrow engine parses in parallel and keeps columns Arrow-backed.
+    # Columns left out of usecols are never materialized
+    return pd.read_csv(csv_path, engine="pyarrow", dtype_backend="pyarrow", usecols=usecols)
 
 
 def load_publication_descriptions(json_path=GOLDEN_DATASET_JSON_STR):
@@ -61,20 +195,72 @@ def load_publication_descriptions(json_path=GOLDEN_DATASET_JSON_STR):
     Returns:
         dict: Mapping from publication_external_id to publication_description
     """
-    with open(json_path, 'r', encoding='utf-8') as f:
-        golden_data = json.load(f)
+    # orjson parses the raw UTF-8 bytes directly and is several times faster than json
+    with open(json_path, 'rb') as f:
+        golden_data = orjson.loads(f.read())
+    
+    # Build the mapping from (id, description) pairs without a Python-level loop
+    return dict(map(itemgetter('publication_external_id', 'publication_description'), golden_data))
+
+
+def create_cached_embeddings(embeddings, namespace, cache_dir=EMBEDDINGS_CACHE_DIR_STR):
+    """
+    Wrap an embeddings model with an on-disk cache.
+    
+    Embeddings are stored under a SHA-256 hash of the text, so unchanged
+    texts are not sent to the embeddings API again on later runs.
+    
+    Args:
+        embeddings: LangChain embeddings model to wrap
+        namespace: Cache namespace, use the model name to keep models apart
+        cache_dir: Directory holding the cached embeddings
+        
+    Returns:
+        CacheBackedEmbeddings: Embeddings model backed by the cache
+    """
+    return CacheBackedEmbeddings.from_bytes_store(
+        embeddings,
+        LocalFileStore(cache_dir),
+        namespace=namespace,
+        query_embedding_cache=True,
+        key_encoder="sha256"
+    )
+
+
+def create_llm_cache(database_path=LLM_CACHE_DB_STR):
+    """
+    Create an on-disk cache for LLM responses.
+    
+    Pass it as the `cache` of a LangChain chat model. Responses are keyed by the
+    full prompt and the model settings, so judging an unchanged sample again
+    on a later run is answered from disk without calling the API.
     
-    return {
-        item['publication_external_id']: item['publication_description'] 
-        for item in golden_data
-    }
+    Args:
+        database_path: SQLite database file holding the cached responses
+        
+    Returns:
+        SQLiteCache: LangChain LLM cache backed by the database
+    """
+    os.makedirs(os.path.dirname(database_path), exist_ok=True)
+    return SQLiteCache(database_path=database_path)
 
 
 class PublicationSample:
     """
     Simple sample class for publication data.
-    Dynamically creates attributes from keyword arguments.
+    Dynamically creates attributes from keyword arguments. The dataset columns are
+    stored in slots; any other column (e.g. a custom metric column) falls back to
+    an instance __dict__, which is only allocated when such a column is set.
     """
+    __slots__ = (
+        'publication_external_id',
+        'title_generated', 'title_truth',
+        'tldr_generated', 'tldr_truth',
+        'references_generated', 'references_truth',
+        'tags_generated', 'tags_truth',
+        '__dict__',
+    )
+    
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
@@ -93,50 +279,58 @@ def format_score(score):
     return f"{score:.3f}" if score is not None else "N/A"
 
 
-def print_evaluation_summary(results_df):
-    """Print comprehensive evaluation summary."""
-    print("\n" + "=" * 70)
-    print("EVALUATION SUMMARY")
-    print("=" * 70)
-    print(f"Total Publications Evaluated: {len(results_df)}")
-    print("Results saved to: evaluation_results.csv")
-    print("Complete results saved to: complete_evaluation_results.csv")
-    
-    print("\nMETRIC STATISTICS:")
-    print("-" * 50)
-    
-    # List of all metrics to display
-    metrics = [
-        ('title_semantic_similarity', 'Title Semantic Similarity'),
-        ('tldr_semantic_similarity', 'Tldr Semantic Similarity'),
-        ('references_semantic_similarity', 'References Semantic Similarity'),
-        ('tags_semantic_similarity', 'Tags Semantic Similarity'),
-        ('references_jaccard_similarity', 'References Jaccard Similarity'),
-        ('tags_jaccard_similarity', 'Tags Jaccard Similarity'),
-        ('title_faithfulness', 'Title Faithfulness'),
-        ('tldr_faithfulness', 'Tldr Faithfulness'),
-        ('references_faithfulness', 'References Faithfulness'),
-        ('tags_faithfulness', 'Tags Faithfulness'),
-        ('content_coherence', 'Content Coherence')  # Add this line
-    ]
+def write_results_file(results_df, path):
+    """
+    Write a results DataFrame, choosing the format from the file extension.
+    
+    Args:
+        results_df: DataFrame to write
+        path: Output path; ".parquet" files are written as zstd-compressed Parquet, anything else
+            as CSV with pyarrow
+    """
+    if str(path).endswith('.parquet'):
+        results_df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+        return
+    
+    try:
+        table = pa.Table.from_pandas(results_df, preserve_index=False)
+    except (pa.ArrowException, TypeError):
+        # Columns Arrow cannot type (e.g. mixed Python objects) use the pandas writer
+        results_df.to_csv(path, index=False)
+        return
+    
+    # pyarrow's C++ CSV writer formats floats much faster than pandas' Python writer.
+    # It quotes all string fields, which CSV readers parse the same way
+    pa_csv.write_csv(table, path)
+
+
+def write_evaluation_results(results_df, complete_results, results_path, complete_path):
+    """
+    Write the scores and the complete results concurrently, one thread per file.
     
-    for metric_col, metric_name in metrics:
-        if metric_col in results_df.columns:
-            valid_scores = results_df[metric_col].dropna()
-            if len(valid_scores) > 0:
-                print(f"\n{metric_name}:")
-                print(f"  Count: {len(valid_scores)}")
-                print(f"  Mean:  {valid_scores.mean():.3f}")
-                print(f"  Std:   {valid_scores.std():.3f}")
-                print(f"  Range: {valid_scores.min():.3f} - {valid_scores.max():.3f}")
+    Args:
+        results_df: DataFrame with the metric scores
+        complete_results: Original data with the metric scores
+        results_path: Output path for the scores
+        complete_path: Output path for the complete results
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(write_results_file, results_df, results_path),
+            executor.submit(write_results_file, complete_results, complete_path),
+        ]
+        for future in futures:
+            future.result()
+
 
-def save_evaluation_results(results, df):
+def save_evaluation_results(results, df, output_format="csv"):
     """
-    Save evaluation results to CSV files.
+    Save evaluation results to CSV or Parquet files.
     
     Args:
-        results: List of result dictionaries
+        results: List of result dictionaries, one per row of df and in the same order
         df: Original DataFrame
+        output_format: "csv" or "parquet"
         
     Returns:
         tuple: (results_df, complete_results_df)
@@ -144,12 +338,20 @@ def save_evaluation_results(results, df):
     # Convert results to DataFrame
     results_df = pd.DataFrame(results)
     
-    # Merge with original data for complete results
-    complete_results = df.merge(results_df, on='publication_external_id', how='left')
+    # Results are in the row order of df, so attach them by position instead of merging on the id
+    complete_results = pd.concat(
+        [df.reset_index(drop=True), results_df.drop(columns='publication_external_id')], axis=1
+    )
     
     # Save results using paths from paths.py
-    results_df.to_csv(EVALUATION_RESULTS_CSV_STR, index=False)
-    complete_results.to_csv(COMPLETE_EVALUATION_RESULTS_CSV_STR, index=False)
+    if output_format == "parquet":
+        write_evaluation_results(
+            results_df, complete_results, EVALUATION_RESULTS_PARQUET_STR, COMPLETE_EVALUATION_RESULTS_PARQUET_STR
+        )
+    else:
+        write_evaluation_results(
+            results_df, complete_results, EVALUATION_RESULTS_CSV_STR, COMPLETE_EVALUATION_RESULTS_CSV_STR
+        )
     
     return results_df, complete_results
 
@@ -164,73 +366,53 @@ def calculate_metric_statistics(results_df):
     Returns:
         dict: Statistics for each metric
     """
-    metric_columns = [
-        'title_semantic_similarity', 'tldr_semantic_similarity',
-        'references_semantic_similarity', 'tags_semantic_similarity',
-        'references_jaccard_similarity', 'tags_jaccard_similarity',
-        'title_faithfulness', 'tldr_faithfulness',
-        'references_faithfulness', 'tags_faithfulness'
-    ]
-    
-    stats = {}
-    for col in metric_columns:
-        non_null_values = results_df[col].dropna()
-        if len(non_null_values) > 0:
-            stats[col] = {
-                'count': len(non_null_values),
-                'mean': non_null_values.mean(),
-                'std': non_null_values.std(),
-                'min': non_null_values.min(),
-                'max': non_null_values.max()
-            }
+    # All statistics in one aggregation, one row per metric; NaNs are skipped
+    stats_df = results_df[list(METRIC_COLUMNS)].agg(['count', 'mean', 'std', 'min', 'max']).T
+    stats_df = stats_df[stats_df['count'] > 0].astype({'count': int})
     
-    return stats
+    return stats_df.to_dict('index')
 
 
-def print_evaluation_summary(results_df):
+def print_evaluation_summary(results_df, results_path=None, complete_path=None):
     """
-    Print comprehensive evaluation summary.
+    Log comprehensive evaluation summary.
     
     Args:
         results_df: DataFrame containing evaluation results
+        results_path: Path the scores were written to, if any
+        complete_path: Path the complete results were written to, if any
     """
-    print("\n" + "="*70)
-    print("EVALUATION SUMMARY")
-    print("="*70)
-    print(f"Total Publications Evaluated: {len(results_df)}")
-    print(f"Results saved to: evaluation_results.csv")
-    print(f"Complete results saved to: complete_evaluation_results.csv")
+    lines = [
+        "\n" + "="*70,
+        "EVALUATION SUMMARY",
+        "="*70,
+        f"Total Publications Evaluated: {len(results_df)}",
+    ]
+    if results_path:
+        lines.append(f"Results saved to: {results_path}")
+    if complete_path:
+        lines.append(f"Complete results saved to: {complete_path}")
     
     # Calculate and display statistics
     stats = calculate_metric_statistics(results_df)
     
-    print("\nMETRIC STATISTICS:")
-    print("-" * 50)
+    lines += ["\nMETRIC STATISTICS:", "-" * 50]
     for metric, stat in stats.items():
         metric_name = metric.replace('_', ' ').title()
-        print(f"\n{metric_name}:")
-        print(f"  Count: {stat['count']}")
-        print(f"  Mean:  {stat['mean']:.3f}")
-        print(f"  Std:   {stat['std']:.3f}")
-        print(f"  Range: {stat['min']:.3f} - {stat['max']:.3f}")
+        lines += [
+            f"\n{metric_name}:",
+            f"  Count: {stat['count']}",
+            f"  Mean:  {stat['mean']:.3f}",
+            f"  Std:   {stat['std']:.3f}",
+            f"  Range: {stat['min']:.3f} - {stat['max']:.3f}",
+        ]
+    
+    logger.info("\n".join(lines))
 
 
 def initialize_result_dict(publication_external_id):
     """Initialize a result dictionary with None values for all metrics."""
-    return {
-        'publication_external_id': publication_external_id,
-        'title_semantic_similarity': None,
-        'title_faithfulness': None,
-        'tldr_semantic_similarity': None,
-        'tldr_faithfulness': None,
-        'references_semantic_similarity': None,
-        'references_jaccard_similarity': None,
-        'references_faithfulness': None,
-        'tags_semantic_similarity': None,
-        'tags_jaccard_similarity': None,
-        'tags_faithfulness': None,
-        'content_coherence': None  # Add this line
-    }
+    return {'publication_external_id': publication_external_id, **_EMPTY_RESULT_TEMPLATE}
 
 def prepare_text_for_semantic_similarity(text, field_type=None):
     """
@@ -248,22 +430,53 @@ def prepare_text_for_semantic_similarity(text, field_type=None):
         text = text.replace('|', ', ')
     return text
 
+async def batch_semantic_similarity(embeddings, responses, references, batch_size=2048):
+    """
+    Compute semantic similarity for many response/reference pairs at once.
+    
+    Each distinct text is embedded once, with batched ``aembed_documents``
+    requests instead of one request per text, and cosine similarity is
+    computed with NumPy.
+    
+    Args:
+        embeddings: LangChain embeddings model (e.g. OpenAIEmbeddings)
+        responses: List of generated texts
+        references: List of ground truth texts, aligned with responses
+        batch_size: Maximum number of texts per embedding request
+        
+    Returns:
+        list: Cosine similarity for each (response, reference) pair
+    """
+    if not responses:
+        return []
+    
+    # Empty strings cannot be embedded, mirror ragas' SemanticSimilarity
+    texts = [text or " " for text in list(responses) + list(references)]
+    
+    # Repeated texts (shared tags, identical titles, ...) are embedded only once
+    text_index = {}
+    positions = np.array([text_index.setdefault(text, len(text_index)) for text in texts])
+    unique_texts = list(text_index)
+    
+    vectors = []
+    for start in range(0, len(unique_texts), batch_size):
+        vectors.extend(await embeddings.aembed_documents(unique_texts[start:start + batch_size]))
+    
+    vectors = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(vectors, axis=1)
+    
+    n = len(responses)
+    response_rows, reference_rows = positions[:n], positions[n:]
+    similarities = (vectors[response_rows] * vectors[reference_rows]).sum(axis=1) / (
+        norms[response_rows] * norms[reference_rows]
+    )
+    return similarities.tolist()
+
+
 def print_evaluation_scores(result):
-    """Print evaluation scores for a single publication."""
-    scores = [
-        ("Title Semantic", result.get('title_semantic_similarity')),
-        ("Title Faithfulness", result.get('title_faithfulness')),
-        ("TLDR Semantic", result.get('tldr_semantic_similarity')),
-        ("TLDR Faithfulness", result.get('tldr_faithfulness')),
-        ("References Semantic", result.get('references_semantic_similarity')),
-        ("References Jaccard", result.get('references_jaccard_similarity')),
-        ("References Faithfulness", result.get('references_faithfulness')),
-        ("Tags Semantic", result.get('tags_semantic_similarity')),
-        ("Tags Jaccard", result.get('tags_jaccard_similarity')),
-        ("Tags Faithfulness", result.get('tags_faithfulness')),
-        ("Content Coherence", result.get('content_coherence'))  # Add this line
+    """Log evaluation scores for a single publication as one debug message."""
+    lines = [f"Scores for {result['publication_external_id']}:"] if 'publication_external_id' in result else []
+    lines += [
+        f"  {_METRIC_LABELS[col]}: {result[col]:.3f}" for col in METRIC_COLUMNS if pd.notna(result.get(col))
     ]
-    
-    for name, score in scores:
-        if score is not None:
-            print(f"  {name}: {score:.3f}")
\ No newline at end of file
+    logger.debug("\n".join(lines))
\ No newline at end of file
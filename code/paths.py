@@ -7,17 +7,30 @@ PROJECT_ROOT = Path(__file__).parent.parent
 CODE_DIR = PROJECT_ROOT / "code"
 DATA_DIR = PROJECT_ROOT / "data"
 METRICS_DIR = CODE_DIR / "metrics"
+CACHE_DIR = PROJECT_ROOT / ".cache"
 
 # Data files
 GOLDEN_DATASET_CSV = DATA_DIR / "golden_dataset_with_references.csv"
 GOLDEN_DATASET_JSON = DATA_DIR / "golden_dataset.json"
 TEST_SET_CSV = DATA_DIR / "test_set.csv"
+TEST_SET_PARQUET = DATA_DIR / "test_set.parquet"
 EVALUATION_RESULTS_CSV = DATA_DIR / "evaluation_results.csv"
 COMPLETE_EVALUATION_RESULTS_CSV = DATA_DIR / "complete_evaluation_results.csv"
+EVALUATION_RESULTS_PARQUET = DATA_DIR / "evaluation_results.parquet"
+COMPLETE_EVALUATION_RESULTS_PARQUET = DATA_DIR / "complete_evaluation_results.parquet"
+
+# Cache directories
+EMBEDDINGS_CACHE_DIR = CACHE_DIR / "embeddings"
+LLM_CACHE_DB = CACHE_DIR / "llm_cache.db"
 
 # Convert to strings for compatibility
 GOLDEN_DATASET_CSV_STR = str(GOLDEN_DATASET_CSV)
 GOLDEN_DATASET_JSON_STR = str(GOLDEN_DATASET_JSON)
 TEST_SET_CSV_STR = str(TEST_SET_CSV)
+TEST_SET_PARQUET_STR = str(TEST_SET_PARQUET)
 EVALUATION_RESULTS_CSV_STR = str(EVALUATION_RESULTS_CSV)
-COMPLETE_EVALUATION_RESULTS_CSV_STR = str(COMPLETE_EVALUATION_RESULTS_CSV)
\ No newline at end of file
+COMPLETE_EVALUATION_RESULTS_CSV_STR = str(COMPLETE_EVALUATION_RESULTS_CSV)
+EVALUATION_RESULTS_PARQUET_STR = str(EVALUATION_RESULTS_PARQUET)
+COMPLETE_EVALUATION_RESULTS_PARQUET_STR = str(COMPLETE_EVALUATION_RESULTS_PARQUET)
+EMBEDDINGS_CACHE_DIR_STR = str(EMBEDDINGS_CACHE_DIR)
+LLM_CACHE_DB_STR = str(LLM_CACHE_DB)
\ No newline at end of file
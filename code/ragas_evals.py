@@ -1,37 +1,60 @@
 import pandas as pd
+import numpy as np
 import asyncio
-from ragas.dataset_schema import SingleTurnSample
-from ragas.metrics import SemanticSimilarity, Faithfulness
-from ragas.embeddings import LangchainEmbeddingsWrapper
+import httpx
 from langchain_openai import OpenAIEmbeddings
 from ragas.llms import LangchainLLMWrapper
+from ragas.run_config import RunConfig
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+import argparse
 import glob
+import logging
 import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
 
 # Import custom metrics
 from metrics.tags_jaccard import create_tags_jaccard_metric
 from metrics.references_jaccard import create_references_jaccard_metric
-from metrics.coherence import ContentCoherenceMetric
+from metrics.coherence import CombinedFaithfulnessCoherenceMetric
 
 # Import utility functions
 from metrics.utils import (
     truncate_context,
     load_dataset,
     load_publication_descriptions,
-    PublicationSample,
     print_evaluation_scores,
     save_evaluation_results,
+    write_evaluation_results,
     print_evaluation_summary,
-    initialize_result_dict,
-    prepare_text_for_semantic_similarity
+    create_cached_embeddings,
+    create_llm_cache,
+    configure_logging,
+    METRIC_COLUMNS,
+    batch_semantic_similarity
 )
 
 from paths import GOLDEN_DATASET_CSV_STR, GOLDEN_DATASET_JSON_STR
 
 load_dotenv()
 
+# Column selections share memory with the loaded frame instead of being copied
+pd.set_option("mode.copy_on_write", True)
+
+# Judge model; gpt-4o-mini and newer apply OpenAI prompt caching to repeated prompt prefixes
+EVALUATOR_MODEL = os.getenv("RAGAS_EVALUATOR_MODEL", "gpt-4o-mini")
+
+# Publications judged concurrently, and timeout (seconds) and retries of each judge
+# and embeddings request; tune RAGAS_CONCURRENCY to the provider's rate limits
+RUN_CONFIG = RunConfig(
+    max_workers=int(os.getenv("RAGAS_CONCURRENCY", "16")),
+    timeout=int(os.getenv("RAGAS_TIMEOUT", "60")),
+    max_retries=int(os.getenv("RAGAS_MAX_RETRIES", "3")),
+)
+
+logger = logging.getLogger(__name__)
+
 
 class CoherenceSample:
     """Custom sample class for coherence evaluation."""
@@ -43,216 +66,380 @@ class CoherenceSample:
         self.tags_generated = tags_generated
 
 
-async def evaluate_single_dataset(csv_file_path):
-    """Evaluate a single CSV dataset."""
+def _init_scorers(http_client):
+    """Create the embeddings and metrics of one run.
     
-    print(f"\n{'='*70}")
-    print(f"EVALUATING: {os.path.basename(csv_file_path)}")
-    print(f"{'='*70}")
-    
-    # Load data
-    df = pd.read_csv(csv_file_path)
-    pub_descriptions = load_publication_descriptions()
+    The LLM and the embeddings share one HTTP client, so connections are kept
+    alive and reused across calls and datasets.
     
+    Args:
+        http_client: httpx.AsyncClient used by the LLM and the embeddings
+        
+    Returns:
+        Tuple of (evaluator_embedding, tags_jaccard, references_jaccard, judge_scorer)
+    """
     # Initialize embeddings and metrics
-    evaluator_embedding = OpenAIEmbeddings(model="text-embedding-ada-002")
-    evaluator_llm = LangchainLLMWrapper(ChatOpenAI(model="gpt-3.5-turbo-16k", temperature=0))
-    
-    semantic_scorer = SemanticSimilarity(
-        embeddings=LangchainEmbeddingsWrapper(evaluator_embedding)
+    evaluator_embedding = create_cached_embeddings(
+        OpenAIEmbeddings(
+            model="text-embedding-ada-002",
+            http_async_client=http_client,
+            request_timeout=RUN_CONFIG.timeout,
+            max_retries=RUN_CONFIG.max_retries
+        ),
+        namespace="text-embedding-ada-002"
+    )
+    evaluator_llm = LangchainLLMWrapper(
+        ChatOpenAI(
+            model=EVALUATOR_MODEL,
+            temperature=0,
+            http_async_client=http_client,
+            timeout=RUN_CONFIG.timeout,
+            max_retries=RUN_CONFIG.max_retries,
+            cache=create_llm_cache()
+        ),
+        run_config=RUN_CONFIG
     )
-    
-    faithfulness_scorer = Faithfulness(llm=evaluator_llm)
     
     # Initialize custom metrics
     tags_jaccard = create_tags_jaccard_metric()
     references_jaccard = create_references_jaccard_metric()
-    coherence_scorer = ContentCoherenceMetric(llm=evaluator_llm)
+    # Faithfulness of every field and content coherence are judged in one LLM call
+    judge_scorer = CombinedFaithfulnessCoherenceMetric(llm=evaluator_llm)
+    
+    return evaluator_embedding, tags_jaccard, references_jaccard, judge_scorer
+
+
+def create_shared_resources():
+    """Create the state shared by every dataset evaluated in one run.
+    
+    The HTTP client, the metrics and the semaphore bind to the event loop that
+    first uses them, so they are created per run; use shared_resources() to
+    have the client closed when the run ends. Responses are still reused
+    across runs through the on-disk embeddings and LLM caches.
+    
+    Returns:
+        Dictionary with the publication descriptions, a memoized context
+        truncation function, the HTTP client, the embeddings, the metrics and
+        the concurrency limit
+    """
+    pub_descriptions = load_publication_descriptions()
+    
+    @lru_cache(maxsize=None)
+    def truncated_context(pub_id):
+        """Truncated publication description, computed once per publication."""
+        return truncate_context(pub_descriptions.get(pub_id, ""), max_tokens=8000, model=EVALUATOR_MODEL)
+    
+    # Size the pool above the request concurrency so requests never queue for a
+    # connection. HTTP/2 would need the optional h2 package, so HTTP/1.1 keep-alive is used
+    max_connections = max(128, 2 * RUN_CONFIG.max_workers)
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 2)
+    )
+    
+    evaluator_embedding, tags_jaccard, references_jaccard, judge_scorer = _init_scorers(http_client)
     
-    # Results storage
-    results = []
+    return {
+        'pub_descriptions': pub_descriptions,
+        'truncated_context': truncated_context,
+        'http_client': http_client,
+        'evaluator_embedding': evaluator_embedding,
+        'tags_jaccard': tags_jaccard,
+        'references_jaccard': references_jaccard,
+        'judge_scorer': judge_scorer,
+        # Bound the number of publications in flight to respect OpenAI rate limits,
+        # across all datasets evaluated together
+        'semaphore': asyncio.Semaphore(RUN_CONFIG.max_workers),
+    }
+
+
+@asynccontextmanager
+async def shared_resources():
+    """Create the shared resources of a run and close their HTTP client when it ends.
     
-    print(f"Evaluating {len(df)} publications...")
+    Yields:
+        Dictionary from create_shared_resources()
+    """
+    shared = create_shared_resources()
+    try:
+        yield shared
+    finally:
+        await shared['http_client'].aclose()
+
+
+async def evaluate_single_dataset(csv_file_path, shared=None, output_format="csv"):
+    """Evaluate a single CSV dataset.
     
-    for index, row in df.iterrows():
-        print(f"Processing publication {index + 1}/{len(df)}: {row['publication_external_id']}")
+    Args:
+        csv_file_path: Path to the dataset CSV file
+        shared: Resources from create_shared_resources(), created if not given
+        output_format: "csv" or "parquet"
         
-        try:
-            # Get publication description for context and truncate if needed
-            pub_id = row['publication_external_id']
-            raw_context = pub_descriptions.get(pub_id, "")
-            context = truncate_context(raw_context, max_tokens=8000)
-            
-            if len(raw_context) > len(context):
-                print(f"  Warning: Context truncated from {len(raw_context)} to {len(context)} characters")
-            
-            # Initialize result dictionary using utility function
-            result = initialize_result_dict(row['publication_external_id'])
-            
-            # 1. Title Evaluation
-            if pd.notna(row['title_truth']) and pd.notna(row['title_generated']):
-                # Semantic Similarity
-                title_sample = SingleTurnSample(
-                    user_input="dummy",
-                    response=str(row['title_generated']),
-                    reference=str(row['title_truth'])
-                )
-                result['title_semantic_similarity'] = await semantic_scorer.single_turn_ascore(title_sample)
-                
-                # Faithfulness
-                title_faithfulness_sample = SingleTurnSample(
-                    user_input="Generate a concise and accurate title for the given content.",
-                    response=str(row['title_generated']),
-                    retrieved_contexts=[context] if context else [""]
-                )
-                result['title_faithfulness'] = await faithfulness_scorer.single_turn_ascore(title_faithfulness_sample)
-            
-            # 2. TLDR Evaluation
-            if pd.notna(row['tldr_truth']) and pd.notna(row['tldr_generated']):
-                # Semantic Similarity
-                tldr_sample = SingleTurnSample(
-                    user_input="dummy",
-                    response=str(row['tldr_generated']),
-                    reference=str(row['tldr_truth'])
+    Returns:
+        Tuple of (results DataFrame, complete results DataFrame)
+    """
+    if shared is None:
+        async with shared_resources() as shared:
+            return await evaluate_single_dataset(csv_file_path, shared, output_format)
+    
+    logger.info(f"\n{'='*70}\nEVALUATING: {os.path.basename(csv_file_path)}\n{'='*70}")
+    
+    # Load data
+    df = load_dataset(csv_file_path)
+    pub_descriptions = shared['pub_descriptions']
+    _truncated_context = shared['truncated_context']
+    evaluator_embedding = shared['evaluator_embedding']
+    tags_jaccard = shared['tags_jaccard']
+    references_jaccard = shared['references_jaccard']
+    judge_scorer = shared['judge_scorer']
+    semaphore = shared['semaphore']
+    
+    # Fields compared against ground truth: (name, truth column, generated column, field type)
+    evaluation_fields = [
+        ('title', 'title_truth', 'title_generated', None),
+        ('tldr', 'tldr_truth', 'tldr_generated', None),
+        ('references', 'references_truth', 'references_generated', None),
+        ('tags', 'tags_truth', 'tags_generated', 'tags'),
+    ]
+    
+    # Column arrays and missing-value masks, read by position instead of per-row Series.
+    # Text columns are cast to str once here rather than per cell in the loops below
+    text_columns = [
+        col for _, truth_col, generated_col, _ in evaluation_fields for col in (truth_col, generated_col)
+    ]
+    pub_ids = df['publication_external_id'].to_numpy()
+    # Integer code per row and the distinct ids, so per-publication work runs once per id.
+    # The frame keeps its original id column, only these local arrays are categorical
+    pub_codes, unique_pub_ids = pd.factorize(pub_ids, use_na_sentinel=False)
+    text = {col: df[col].astype(str).to_numpy() for col in text_columns}
+    valid = {col: df[col].notna().to_numpy() for col in text_columns}
+    
+    # Texts as compared for semantic similarity and shown to the judge. Tags get the
+    # prepare_text_for_semantic_similarity treatment as one vectorized replace per column
+    prepared = dict(text)
+    for _, truth_col, generated_col, field_type in evaluation_fields:
+        if field_type == 'tags':
+            for col in (truth_col, generated_col):
+                prepared[col] = (
+                    df[col].astype("string[pyarrow]").str.replace('|', ', ', regex=False).astype(str).to_numpy()
                 )
-                result['tldr_semantic_similarity'] = await semantic_scorer.single_turn_ascore(tldr_sample)
-                
-                # Faithfulness
-                tldr_faithfulness_sample = SingleTurnSample(
-                    user_input="Provide a concise summary (TL;DR) for the given content that captures the main points and key takeaways.",
-                    response=str(row['tldr_generated']),
-                    retrieved_contexts=[context] if context else [""]
+    
+    # Score storage: one float array per metric, NaN until a score is written
+    n_rows = len(df)
+    scores = {col: np.full(n_rows, np.nan) for col in METRIC_COLUMNS}
+    
+    # Rows where both the truth and generated values of a field are present
+    evaluable_masks = {
+        field_name: valid[truth_col] & valid[generated_col]
+        for field_name, truth_col, generated_col, _ in evaluation_fields
+    }
+    evaluable_rows = {field_name: np.flatnonzero(mask) for field_name, mask in evaluable_masks.items()}
+    
+    # Coherence needs a context and every generated field
+    coherence_mask = np.logical_and.reduce(
+        [valid[generated_col] for _, _, generated_col, _ in evaluation_fields]
+        + [np.array([bool(pub_descriptions.get(pub_id)) for pub_id in unique_pub_ids], dtype=bool)[pub_codes]]
+    )
+    
+    # Scores written by the LLM judge, cleared again if judging a row fails
+    judge_columns = [f'{field_name}_faithfulness' for field_name, _, _, _ in evaluation_fields] + ['content_coherence']
+    
+    # Only rows with something to judge enter the LLM loop
+    judge_rows = np.flatnonzero(np.logical_or.reduce(list(evaluable_masks.values()) + [coherence_mask]))
+    
+    # Semantic similarity for every field of every row, embedded in batched requests
+    responses, references = [], []
+    for field_name, truth_col, generated_col, _ in evaluation_fields:
+        for i in evaluable_rows[field_name]:
+            responses.append(prepared[generated_col][i])
+            references.append(prepared[truth_col][i])
+    
+    # Jaccard similarity needs no LLM, score every row up front from truth tokenized once per publication
+    jaccard_metrics = {'references': references_jaccard, 'tags': tags_jaccard}
+    
+    def _score_jaccard():
+        """Score the Jaccard metrics of every evaluable row into the score arrays."""
+        for field_name, truth_col, generated_col, _ in evaluation_fields:
+            if field_name in jaccard_metrics:
+                jaccard_metrics[field_name].prepare(df)
+                rows = evaluable_rows[field_name]
+                scores[f'{field_name}_jaccard_similarity'][rows] = jaccard_metrics[field_name].score_batch(
+                    [text[generated_col][i] for i in rows],
+                    [text[truth_col][i] for i in rows],
+                    pub_ids[rows]
                 )
-                result['tldr_faithfulness'] = await faithfulness_scorer.single_turn_ascore(tldr_faithfulness_sample)
+    
+    # The CPU-bound Jaccard pass runs in a worker thread while the embedding requests are in
+    # flight, so it neither waits for them nor blocks other datasets' API calls
+    logger.info(f"Embedding {len(responses)} semantic similarity pairs...")
+    similarities, _ = await asyncio.gather(
+        batch_semantic_similarity(evaluator_embedding, responses, references),
+        asyncio.to_thread(_score_jaccard),
+    )
+    offset = 0
+    for field_name, _, _, _ in evaluation_fields:
+        rows = evaluable_rows[field_name]
+        scores[f'{field_name}_semantic_similarity'][rows] = similarities[offset:offset + len(rows)]
+        offset += len(rows)
+    
+    async def _eval_row(i):
+        """Evaluate the publication at position i, writing LLM scores into the score arrays."""
+        async with semaphore:
+            pub_id = pub_ids[i]
+            logger.debug(f"Processing publication {i + 1}/{n_rows}: {pub_id}")
             
-            # 3. References Evaluation
-            if pd.notna(row['references_truth']) and pd.notna(row['references_generated']):
-                # Semantic Similarity
-                refs_truth_text = str(row['references_truth'])
-                refs_generated_text = str(row['references_generated'])
-                refs_semantic_sample = SingleTurnSample(
-                    user_input="dummy",
-                    response=refs_generated_text,
-                    reference=refs_truth_text
-                )
-                result['references_semantic_similarity'] = await semantic_scorer.single_turn_ascore(refs_semantic_sample)
+            try:
+                # Get publication description for context and truncate if needed
+                raw_context = pub_descriptions.get(pub_id, "")
+                context = _truncated_context(pub_id)
                 
-                # Jaccard Similarity
-                refs_sample = PublicationSample(
-                    references_generated=str(row['references_generated']),
-                    references_truth=str(row['references_truth'])
-                )
-                result['references_jaccard_similarity'] = await references_jaccard._single_turn_ascore(refs_sample, callbacks=None)
+                if len(raw_context) > len(context):
+                    logger.debug(f"  Context of {pub_id} truncated from {len(raw_context)} to {len(context)} characters")
                 
-                # Faithfulness
-                refs_faithfulness_sample = SingleTurnSample(
-                    user_input="Extract and list the relevant references and citations mentioned in the given content.",
-                    response=refs_generated_text,
-                    retrieved_contexts=[context] if context else [""]
-                )
-                result['references_faithfulness'] = await faithfulness_scorer.single_turn_ascore(refs_faithfulness_sample)
-            
-            # 4. Tags Evaluation
-            if pd.notna(row['tags_truth']) and pd.notna(row['tags_generated']):
-                # Semantic Similarity
-                tags_truth_text = prepare_text_for_semantic_similarity(row['tags_truth'], 'tags')
-                tags_generated_text = prepare_text_for_semantic_similarity(row['tags_generated'], 'tags')
-                tags_semantic_sample = SingleTurnSample(
-                    user_input="dummy",
-                    response=tags_generated_text,
-                    reference=tags_truth_text
-                )
-                result['tags_semantic_similarity'] = await semantic_scorer.single_turn_ascore(tags_semantic_sample)
+                evaluable = [field_name for field_name, mask in evaluable_masks.items() if mask[i]]
                 
-                # Jaccard Similarity
-                tags_sample = PublicationSample(
-                    tags_generated=str(row['tags_generated']),
-                    tags_truth=str(row['tags_truth'])
+                # Semantic and Jaccard similarity were computed in batch above.
+                # Faithfulness and Content Coherence are judged together against the context
+                judge_sample = CoherenceSample(
+                    context=context,
+                    title_generated=text['title_generated'][i] if valid['title_generated'][i] else "",
+                    tldr_generated=text['tldr_generated'][i] if valid['tldr_generated'][i] else "",
+                    references_generated=text['references_generated'][i] if valid['references_generated'][i] else "",
+                    tags_generated=prepared['tags_generated'][i] if valid['tags_generated'][i] else ""
                 )
-                result['tags_jaccard_similarity'] = await tags_jaccard._single_turn_ascore(tags_sample, callbacks=None)
+                judge_scores = await judge_scorer.score_components(judge_sample)
                 
-                # Faithfulness
-                tags_faithfulness_sample = SingleTurnSample(
-                    user_input="Generate relevant tags and keywords that accurately represent the main topics and themes of the given content.",
-                    response=tags_generated_text,
-                    retrieved_contexts=[context] if context else [""]
-                )
-                result['tags_faithfulness'] = await faithfulness_scorer.single_turn_ascore(tags_faithfulness_sample)
-            
-            # 5. Content Coherence Evaluation
-            if (context and 
-                pd.notna(row['title_generated']) and 
-                pd.notna(row['tldr_generated']) and 
-                pd.notna(row['references_generated']) and 
-                pd.notna(row['tags_generated'])):
+                for field_name in evaluable:
+                    scores[f'{field_name}_faithfulness'][i] = getattr(judge_scores, f'{field_name}_faithfulness')
+                if coherence_mask[i]:
+                    scores['content_coherence'][i] = judge_scores.content_coherence
                 
-                # Create custom sample for coherence evaluation
-                coherence_sample = CoherenceSample(
-                    context=context,
-                    title_generated=str(row['title_generated']),
-                    tldr_generated=str(row['tldr_generated']),
-                    references_generated=str(row['references_generated']),
-                    tags_generated=str(row['tags_generated'])
-                )
+                # Log scores using utility function
+                if logger.isEnabledFor(logging.DEBUG):
+                    print_evaluation_scores({
+                        'publication_external_id': pub_id,
+                        **{col: values[i] for col, values in scores.items()}
+                    })
                 
-                result['content_coherence'] = await coherence_scorer._single_turn_ascore(coherence_sample, callbacks=None)
-            
-            results.append(result)
-            
-            # Print scores using utility function
-            print_evaluation_scores(result)
-            
-        except Exception as e:
-            print(f"Error processing publication {row['publication_external_id']}: {e}")
-            import traceback
-            traceback.print_exc()
-            # Still add the result with None values using utility function
-            result = initialize_result_dict(row['publication_external_id'])
-            results.append(result)
+            except Exception as e:
+                logger.exception(f"Error processing publication {pub_id}: {e}")
+                # Still keep the row; only the judge scores are cleared, the batched
+                # semantic and Jaccard scores do not depend on the failed call
+                for col in judge_columns:
+                    scores[col][i] = np.nan
+    
+    # Tokenize and truncate each publication's context once, in a worker thread so the
+    # event loop keeps serving requests of other datasets; rows then hit the memo
+    await asyncio.to_thread(lambda: [_truncated_context(pub_id) for pub_id in unique_pub_ids[np.unique(pub_codes[judge_rows])]])
+    
+    logger.info(
+        f"Evaluating {len(judge_rows)} of {n_rows} publications from {os.path.basename(csv_file_path)}..."
+    )
+    
+    await asyncio.gather(*[_eval_row(i) for i in judge_rows])
     
     # Save results with dataset name prefix
     dataset_name = os.path.splitext(os.path.basename(csv_file_path))[0]
-    results_df = pd.DataFrame(results)
+    results_df = pd.DataFrame(scores)
+    results_df.insert(0, 'publication_external_id', pub_ids)
     
-    # Merge with original data
-    complete_results = df.merge(results_df, on='publication_external_id', how='left')
+    # Scores are stored in the row order of df, so attach them by position instead of merging on the id
+    complete_results = pd.concat(
+        [df.reset_index(drop=True), results_df.drop(columns='publication_external_id')], axis=1
+    )
     
-    # Save files with dataset name prefix
-    results_filename = f"./data/{dataset_name}_evaluation_results.csv"
-    complete_filename = f"./data/{dataset_name}_complete_evaluation_results.csv"
+    # Save files with dataset name prefix, off the event loop so other datasets keep evaluating
+    results_filename = f"./data/{dataset_name}_evaluation_results.{output_format}"
+    complete_filename = f"./data/{dataset_name}_complete_evaluation_results.{output_format}"
     
-    results_df.to_csv(results_filename, index=False)
-    complete_results.to_csv(complete_filename, index=False)
+    await asyncio.to_thread(
+        write_evaluation_results, results_df, complete_results, results_filename, complete_filename
+    )
     
-    print(f"\nResults saved to: {results_filename}")
-    print(f"Complete results saved to: {complete_filename}")
+    # Print summary, including where the files were written
+    print_evaluation_summary(results_df, results_filename, complete_filename)
     
-    # Print summary
-    print_evaluation_summary(results_df)
+    return results_df, complete_results
+
+
+async def evaluate_golden_dataset(output_format="csv"):
+    """Evaluate the main golden dataset.
+    
+    Args:
+        output_format: "csv" or "parquet"
+        
+    Returns:
+        Tuple of (results DataFrame, complete results DataFrame), (None, None) on failure
+    """
+    logger.info("🚀 Starting evaluation of the Golden Dataset")
+    logger.info(f"📁 Dataset path: {GOLDEN_DATASET_CSV_STR}")
     
+    # Same path as the command line, so both entry points share one setup
+    [(results_df, complete_results)] = await evaluate_datasets([GOLDEN_DATASET_CSV_STR], output_format)
+    if results_df is not None:
+        logger.info("\n✅ Golden dataset evaluation completed!")
     return results_df, complete_results
 
 
-async def evaluate_golden_dataset():
-    """Evaluate the main golden dataset."""
+async def evaluate_datasets(csv_paths, output_format="csv"):
+    """Evaluate several CSV datasets concurrently.
     
-    print("🚀 Starting evaluation of the Golden Dataset")
-    print(f"📁 Dataset path: {GOLDEN_DATASET_CSV_STR}")
+    Publication descriptions, embeddings, metrics and the concurrency limit are
+    shared, so API waits of all datasets interleave under one rate limit.
     
-    try:
-        results_df, complete_results = await evaluate_single_dataset(GOLDEN_DATASET_CSV_STR)
-        print("\n✅ Golden dataset evaluation completed!")
-        return results_df, complete_results
-    except Exception as e:
-        print(f"❌ Error evaluating golden dataset: {e}")
-        import traceback
-        traceback.print_exc()
-        return None, None
+    Args:
+        csv_paths: Paths of the dataset CSV files
+        output_format: "csv" or "parquet"
+        
+    Returns:
+        List of (results DataFrame, complete results DataFrame) tuples, in the
+        order of csv_paths; (None, None) for datasets that failed
+    """
+    async with shared_resources() as shared:
+        
+        async def _evaluate(csv_file_path):
+            try:
+                return await evaluate_single_dataset(csv_file_path, shared, output_format)
+            except Exception as e:
+                logger.exception(f"❌ Error evaluating {csv_file_path}: {e}")
+                return None, None
+        
+        return await asyncio.gather(*(_evaluate(p) for p in csv_paths))
 
 
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Evaluate publication datasets with Ragas metrics.")
+    parser.add_argument(
+        "datasets", nargs="*", default=[GOLDEN_DATASET_CSV_STR],
+        help="Dataset CSV files or glob patterns (default: the golden dataset)"
+    )
+    parser.add_argument(
+        "--format", choices=["csv", "parquet"], default="csv", dest="output_format",
+        help="Output file format; Parquet is faster to write and smaller (default: csv)"
+    )
+    return parser.parse_args(argv)
 
 
+async def main(argv=None):
+    """Evaluate the datasets given on the command line."""
+    args = parse_args(argv)
+    
+    # Expand glob patterns, keeping the order given and dropping duplicates
+    csv_paths = list(dict.fromkeys(
+        path for pattern in args.datasets for path in (sorted(glob.glob(pattern)) or [pattern])
+    ))
+    
+    logger.info(f"🚀 Starting evaluation of {len(csv_paths)} dataset(s)")
+    results = await evaluate_datasets(csv_paths, args.output_format)
+    
+    failed = sum(results_df is None for results_df, _ in results)
+    logger.info(f"\n✅ Evaluated {len(csv_paths) - failed}/{len(csv_paths)} dataset(s)")
+    return results
+
 
 if __name__ == "__main__":
+    # Set RAGAS_LOG_LEVEL=DEBUG to see per-publication progress and scores
+    configure_logging(os.getenv("RAGAS_LOG_LEVEL", "INFO"))
+    
     # Evaluate datasets
-    asyncio.run(evaluate_golden_dataset())
\ No newline at end of file
+    asyncio.run(main())